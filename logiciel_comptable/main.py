@@ -13,7 +13,7 @@ def main() -> int:
     """Start the Qt event loop and show the main window."""
 
     # Ensure the database is initialised before launching the UI.
-    _ = db_module.db_manager
+    db_module.get_db_manager()
 
     app = QApplication(sys.argv)
     window = MainWindow()
@@ -1,23 +1,79 @@
 """Business logic related to client management."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import sqlite3
+from typing import Dict, Iterable, List, Optional
 
+from modules import factures
 from utils.db_manager import db_manager
 
 
-def create_client(nom: str, email: str, telephone: str, adresse: str) -> int:
-    """Insert a new client and return its identifier."""
+# Cached result of :func:`get_all_clients`, dropped on every write.
+_cache: Optional[List[sqlite3.Row]] = None
 
-    cursor = db_manager.execute(
+# Monotonic counter bumped by every write; widgets compare it to the
+# version they last displayed to skip reloads when nothing changed.
+_version = 0
+
+
+def data_version() -> int:
+    """Return a counter incremented by every client write."""
+
+    return _version
+
+
+def _invalidate_cache() -> None:
+    """Drop the cached client list after any write.
+
+    Invoice listings embed the client name, so their cache is dropped as
+    well to keep the two views consistent.
+    """
+
+    global _cache, _version
+    _cache = None
+    _version += 1
+    factures.invalidate_cache()
+
+
+def create_client(
+    nom: str, email: str, telephone: str, adresse: str
+) -> Dict[str, Optional[str]]:
+    """Insert a new client and return the created row.
+
+    The RETURNING clause hands the stored row back in the same round-trip,
+    so callers can display the new client without re-reading the table.
+    """
+
+    row = db_manager.execute(
         """
         INSERT INTO clients (nom, email, telephone, adresse)
         VALUES (?, ?, ?, ?)
+        RETURNING id, nom, email, telephone, adresse
         """,
         (nom, email, telephone, adresse),
+        fetchone=True,
         commit=True,
     )
-    return cursor.lastrowid
+    _invalidate_cache()
+    return dict(row)
+
+
+def create_clients(rows: Iterable[tuple]) -> None:
+    """Insert several clients inside a single transaction.
+
+    Each row is a ``(nom, email, telephone, adresse)`` tuple.  Batching the
+    inserts amortises the commit over the whole batch instead of paying one
+    fsync per client, which makes bulk imports considerably faster.
+    """
+
+    db_manager.executemany(
+        """
+        INSERT INTO clients (nom, email, telephone, adresse)
+        VALUES (?, ?, ?, ?)
+        """,
+        rows,
+    )
+    _invalidate_cache()
 
 
 def update_client(
@@ -42,6 +98,7 @@ def update_client(
         (nom, email, telephone, adresse, client_id),
         commit=True,
     )
+    _invalidate_cache()
 
 
 def delete_client(client_id: int) -> None:
@@ -52,24 +109,48 @@ def delete_client(client_id: int) -> None:
         (client_id,),
         commit=True,
     )
+    _invalidate_cache()
 
 
-def get_all_clients() -> List[Dict[str, Optional[str]]]:
-    """Return all clients ordered alphabetically by name."""
+def get_all_clients(*, nom_like: Optional[str] = None) -> List[sqlite3.Row]:
+    """Return all clients ordered alphabetically by name.
 
-    rows = db_manager.execute(
-        "SELECT id, nom, email, telephone, adresse FROM clients ORDER BY nom",
+    Rows are returned as :class:`sqlite3.Row` objects, which already support
+    access by column name, so no per-row dict is materialised.  When
+    ``nom_like`` is given the filtering happens in SQL, where the index on
+    ``nom`` applies, instead of in Python.  The unfiltered result is cached
+    until the next write so repeated refreshes do not hit the database when
+    nothing has changed.
+    """
+
+    global _cache
+    if nom_like is None:
+        if _cache is not None:
+            return _cache
+
+        _cache = db_manager.execute(
+            "SELECT id, nom, email, telephone, adresse FROM clients ORDER BY nom",
+            fetchall=True,
+        )
+        return _cache
+
+    return db_manager.execute(
+        """
+        SELECT id, nom, email, telephone, adresse
+          FROM clients
+         WHERE nom LIKE ?
+         ORDER BY nom
+        """,
+        (f"%{nom_like}%",),
         fetchall=True,
     )
-    return [dict(row) for row in rows]
 
 
 def get_client(client_id: int) -> Optional[Dict[str, Optional[str]]]:
     """Retrieve a single client by its identifier."""
 
-    row = db_manager.execute(
+    row = db_manager.fetchone(
         "SELECT id, nom, email, telephone, adresse FROM clients WHERE id = ?",
         (client_id,),
-        fetchone=True,
     )
     return dict(row) if row else None
@@ -1,35 +1,81 @@
 """Business logic to handle accounting journal entries."""
 from __future__ import annotations
 
-from typing import Dict, List
+import sqlite3
+from typing import Iterable, List, Optional
 
 from utils.db_manager import db_manager
 
 
+# Monotonic counter bumped by every write; widgets compare it to the
+# version they last displayed to skip reloads when nothing changed.
+_version = 0
+
+
+def data_version() -> int:
+    """Return a counter incremented by every journal write."""
+
+    return _version
+
+
+def _bump_version() -> None:
+    global _version
+    _version += 1
+
+
 def create_entry(
     date_ecriture: str,
     libelle: str,
     compte_debit: str,
     compte_credit: str,
     montant: float,
-) -> int:
-    """Insert a new accounting entry and return its identifier."""
+) -> dict:
+    """Insert a new accounting entry and return the created row.
 
-    cursor = db_manager.execute(
+    The RETURNING clause hands the stored row back in the same round-trip,
+    so callers can display the new entry without re-reading the journal.
+    """
+
+    row = db_manager.execute(
         """
         INSERT INTO ecritures (date_ecriture, libelle, compte_debit, compte_credit, montant)
         VALUES (?, ?, ?, ?, ?)
+        RETURNING id, date_ecriture, libelle, compte_debit, compte_credit, montant
         """,
         (date_ecriture, libelle, compte_debit, compte_credit, montant),
+        fetchone=True,
         commit=True,
     )
-    return cursor.lastrowid
+    _bump_version()
+    return dict(row)
+
+
+def create_entries(rows: Iterable[tuple]) -> None:
+    """Insert several accounting entries inside a single transaction.
+
+    Each row is a ``(date_ecriture, libelle, compte_debit, compte_credit,
+    montant)`` tuple.  The whole batch is committed at once so importing a
+    large journal costs a single fsync instead of one per entry.
+    """
+
+    db_manager.executemany(
+        """
+        INSERT INTO ecritures (date_ecriture, libelle, compte_debit, compte_credit, montant)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    _bump_version()
+
 
+def get_all_entries() -> List[sqlite3.Row]:
+    """Return all accounting entries ordered by date descending.
 
-def get_all_entries() -> List[Dict[str, str]]:
-    """Return all accounting entries ordered by date descending."""
+    Rows are returned as :class:`sqlite3.Row` objects; no per-row dict is
+    materialised.
+    """
 
-    rows = db_manager.execute(
+    return db_manager.execute(
         """
         SELECT id, date_ecriture, libelle, compte_debit, compte_credit, montant
           FROM ecritures
@@ -37,4 +83,40 @@ def get_all_entries() -> List[Dict[str, str]]:
         """,
         fetchall=True,
     )
-    return [dict(row) for row in rows]
+
+
+def get_entries_page(
+    offset: int, limit: int, *, libelle_like: Optional[str] = None
+) -> List[sqlite3.Row]:
+    """Return one page of entries ordered by date descending.
+
+    ``libelle_like`` filters on the entry label in SQL so only matching
+    rows are marshalled into Python.
+    """
+
+    query = """
+        SELECT id, date_ecriture, libelle, compte_debit, compte_credit, montant
+          FROM ecritures
+    """
+    parameters: list = []
+    if libelle_like is not None:
+        query += " WHERE libelle LIKE ?"
+        parameters.append(f"%{libelle_like}%")
+    query += " ORDER BY date_ecriture DESC, id DESC LIMIT ? OFFSET ?"
+    parameters += [limit, offset]
+
+    return db_manager.execute(query, parameters, fetchall=True)
+
+
+def count_entries(*, libelle_like: Optional[str] = None) -> int:
+    """Return the number of accounting entries matching the filter."""
+
+    if libelle_like is None:
+        row = db_manager.execute("SELECT COUNT(*) FROM ecritures", fetchone=True)
+    else:
+        row = db_manager.execute(
+            "SELECT COUNT(*) FROM ecritures WHERE libelle LIKE ?",
+            (f"%{libelle_like}%",),
+            fetchone=True,
+        )
+    return row[0]
@@ -1,7 +1,8 @@
 """Business logic related to invoice management."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import sqlite3
+from typing import Dict, Iterable, List, Optional
 
 from utils.db_manager import db_manager
 
@@ -9,6 +10,28 @@ from utils.db_manager import db_manager
 STATUT_EN_ATTENTE = "En attente"
 STATUT_PAYEE = "Payée"
 
+# Cached result of :func:`get_all_invoices`, dropped on every write.
+_cache: Optional[List[sqlite3.Row]] = None
+
+# Monotonic counter bumped by every write (including client renames, which
+# invalidate through here); widgets compare it to the version they last
+# displayed to skip reloads when nothing changed.
+_version = 0
+
+
+def data_version() -> int:
+    """Return a counter incremented by every invoice write."""
+
+    return _version
+
+
+def invalidate_cache() -> None:
+    """Drop the cached invoice list so the next read hits the database."""
+
+    global _cache, _version
+    _cache = None
+    _version += 1
+
 
 def create_invoice(
     client_id: int,
@@ -16,19 +39,52 @@ def create_invoice(
     montant_ht: float,
     taux_tva: float,
     statut: str = STATUT_EN_ATTENTE,
-) -> int:
-    """Create a new invoice and return its identifier."""
+) -> Dict[str, Optional[str]]:
+    """Create a new invoice and return the stored row.
+
+    ``montant_ttc`` is a generated column computed by SQLite from
+    ``montant_ht`` and ``taux_tva``; the RETURNING clause hands it back
+    along with the rest of the row, so callers never need to re-read the
+    table.  The client name is resolved with one indexed lookup so the
+    result matches the shape of :func:`get_all_invoices` rows.
+    """
 
-    montant_ttc = montant_ht * (1 + taux_tva / 100)
-    cursor = db_manager.execute(
+    row = db_manager.execute(
         """
-        INSERT INTO factures (client_id, date_facture, montant_ht, taux_tva, montant_ttc, statut)
-        VALUES (?, ?, ?, ?, ?, ?)
+        INSERT INTO factures (client_id, date_facture, montant_ht, taux_tva, statut)
+        VALUES (?, ?, ?, ?, ?)
+        RETURNING id, client_id, date_facture, montant_ht, taux_tva, montant_ttc, statut
         """,
-        (client_id, date_facture, montant_ht, taux_tva, montant_ttc, statut),
+        (client_id, date_facture, montant_ht, taux_tva, statut),
+        fetchone=True,
         commit=True,
     )
-    return cursor.lastrowid
+    invalidate_cache()
+
+    invoice = dict(row)
+    client = db_manager.execute(
+        "SELECT nom FROM clients WHERE id = ?", (client_id,), fetchone=True
+    )
+    invoice["client"] = client["nom"] if client else ""
+    return invoice
+
+
+def create_invoices(rows: Iterable[tuple]) -> None:
+    """Insert several invoices inside a single transaction.
+
+    Each row is a ``(client_id, date_facture, montant_ht, taux_tva, statut)``
+    tuple; ``montant_ttc`` is computed by SQLite's generated column and the
+    whole batch only pays one commit.
+    """
+
+    db_manager.executemany(
+        """
+        INSERT INTO factures (client_id, date_facture, montant_ht, taux_tva, statut)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    invalidate_cache()
 
 
 def update_invoice_status(invoice_id: int, statut: str) -> None:
@@ -39,6 +95,7 @@ def update_invoice_status(invoice_id: int, statut: str) -> None:
         (statut, invoice_id),
         commit=True,
     )
+    invalidate_cache()
 
 
 def update_invoice(
@@ -49,9 +106,11 @@ def update_invoice(
     taux_tva: float,
     statut: str,
 ) -> None:
-    """Update every field of an invoice."""
+    """Update every field of an invoice.
+
+    ``montant_ttc`` follows automatically through its generated column.
+    """
 
-    montant_ttc = montant_ht * (1 + taux_tva / 100)
     db_manager.execute(
         """
         UPDATE factures
@@ -59,13 +118,13 @@ def update_invoice(
                date_facture = ?,
                montant_ht = ?,
                taux_tva = ?,
-               montant_ttc = ?,
                statut = ?
          WHERE id = ?
         """,
-        (client_id, date_facture, montant_ht, taux_tva, montant_ttc, statut, invoice_id),
+        (client_id, date_facture, montant_ht, taux_tva, statut, invoice_id),
         commit=True,
     )
+    invalidate_cache()
 
 
 def delete_invoice(invoice_id: int) -> None:
@@ -76,34 +135,139 @@ def delete_invoice(invoice_id: int) -> None:
         (invoice_id,),
         commit=True,
     )
+    invalidate_cache()
 
 
-def get_all_invoices() -> List[Dict[str, Optional[str]]]:
-    """Return the list of invoices including the related client name."""
+def get_all_invoices(
+    *,
+    client_like: Optional[str] = None,
+    statut: Optional[str] = None,
+    since: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[sqlite3.Row]:
+    """Return the list of invoices including the related client name.
+
+    Rows are returned as :class:`sqlite3.Row` objects; no per-row dict is
+    materialised.  The client name is read from the denormalised
+    ``client_nom`` column, kept in sync by database triggers, so the
+    listing never joins the clients table.  Filters and pagination run in
+    SQL, where the index on ``date_facture`` applies, and the unfiltered
+    result is cached until the next write.
+    """
+
+    global _cache
+    filtered = (
+        client_like is not None
+        or statut is not None
+        or since is not None
+        or limit is not None
+    )
+    if not filtered and _cache is not None:
+        return _cache
 
-    rows = db_manager.execute(
+    query = """
+        SELECT id,
+               client_id,
+               client_nom AS client,
+               date_facture,
+               montant_ht,
+               taux_tva,
+               montant_ttc,
+               statut
+          FROM factures
+    """
+    conditions = []
+    parameters: list = []
+    if client_like is not None:
+        conditions.append("client_nom LIKE ?")
+        parameters.append(f"%{client_like}%")
+    if statut is not None:
+        conditions.append("statut = ?")
+        parameters.append(statut)
+    if since is not None:
+        conditions.append("date_facture >= ?")
+        parameters.append(since)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY date_facture DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        parameters += [limit, offset]
+
+    rows = db_manager.execute(query, parameters, fetchall=True)
+    if not filtered:
+        _cache = rows
+    return rows
+
+
+def count_invoices() -> int:
+    """Return the total number of invoices."""
+
+    row = db_manager.fetchone("SELECT COUNT(*) FROM factures")
+    return row[0]
+
+
+#: Column order of :func:`get_all_invoices` rows.
+INVOICE_COLUMNS = (
+    "id",
+    "client_id",
+    "client",
+    "date_facture",
+    "montant_ht",
+    "taux_tva",
+    "montant_ttc",
+    "statut",
+)
+
+
+# Columnar cache for :func:`get_all_invoices_columns`, keyed on _version.
+_columns_cache: Optional[Dict[str, tuple]] = None
+_columns_version = -1
+
+
+def get_all_invoices_columns() -> Dict[str, tuple]:
+    """Return the invoice listing as one value tuple per column.
+
+    Rows are fetched as plain tuples (``raw=True`` skips the sqlite3.Row
+    wrapper per row) and transposed with a single ``zip`` call, which runs
+    in C, so producing a columnar result for the table model costs no
+    Python loop per row.  Keys follow :data:`INVOICE_COLUMNS`; the result
+    is cached until the next write.
+    """
+
+    global _columns_cache, _columns_version
+    if _columns_cache is not None and _columns_version == _version:
+        return _columns_cache
+
+    rows = db_manager.fetchall(
         """
-        SELECT f.id,
-               f.client_id,
-               c.nom AS client,
-               f.date_facture,
-               f.montant_ht,
-               f.taux_tva,
-               f.montant_ttc,
-               f.statut
-          FROM factures AS f
-          JOIN clients AS c ON c.id = f.client_id
-         ORDER BY f.date_facture DESC, f.id DESC
+        SELECT id,
+               client_id,
+               client_nom AS client,
+               date_facture,
+               montant_ht,
+               taux_tva,
+               montant_ttc,
+               statut
+          FROM factures
+         ORDER BY date_facture DESC, id DESC
         """,
-        fetchall=True,
+        raw=True,
     )
-    return [dict(row) for row in rows]
+    if rows:
+        columns = dict(zip(INVOICE_COLUMNS, zip(*rows)))
+    else:
+        columns = {key: () for key in INVOICE_COLUMNS}
+    _columns_cache = columns
+    _columns_version = _version
+    return columns
 
 
 def get_invoice(invoice_id: int) -> Optional[Dict[str, Optional[str]]]:
     """Return a single invoice by its identifier."""
 
-    row = db_manager.execute(
+    row = db_manager.fetchone(
         """
         SELECT f.id,
                f.client_id,
@@ -116,6 +280,5 @@ def get_invoice(invoice_id: int) -> Optional[Dict[str, Optional[str]]]:
          WHERE f.id = ?
         """,
         (invoice_id,),
-        fetchone=True,
     )
     return dict(row) if row else None
@@ -1,10 +1,12 @@
 """Graphical interface for client management."""
 from __future__ import annotations
 
+import csv
 from typing import List, Optional
 
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
 from PySide6.QtWidgets import (
+    QFileDialog,
     QFormLayout,
     QHBoxLayout,
     QLabel,
@@ -17,36 +19,50 @@ from PySide6.QtWidgets import (
 )
 
 from modules import clients as clients_module
+from ui.workers import run_in_background
 
 
 class ClientsTableModel(QAbstractTableModel):
     """Table model exposing client records to a :class:`QTableView`."""
 
-    headers = ["ID", "Nom", "Email", "Téléphone", "Adresse"]
+    headers = ("ID", "Nom", "Email", "Téléphone", "Adresse")
+
+    # Column-to-key mapping, built once: data() runs for every visible cell
+    # on every repaint, so it must not allocate a fresh list each call.
+    _KEYS = ("id", "nom", "email", "telephone", "adresse")
 
     def __init__(self, clients: Optional[List[dict]] = None) -> None:
         super().__init__()
-        self._clients: List[dict] = clients or []
+        self._cols: List[list] = self._columns_from(clients or [])
+
+    @classmethod
+    def _columns_from(cls, clients: List[dict]) -> List[list]:
+        """Build one value list per column from a list of client rows.
+
+        Storing columns instead of row dicts turns every cell access into a
+        plain list index and keeps each column's values contiguous, which is
+        what the paint path in :meth:`data` iterates over.
+        """
+
+        return [[client[key] for client in clients] for key in cls._KEYS]
 
     # ------------------------------------------------------------------
     # Model interface
     def rowCount(self, parent: QModelIndex | None = None) -> int:  # type: ignore[override]
-        return len(self._clients)
+        return len(self._cols[0])
 
     def columnCount(self, parent: QModelIndex | None = None) -> int:  # type: ignore[override]
         return len(self.headers)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
-        if not index.isValid() or not (0 <= index.row() < len(self._clients)):
+        # Qt probes every cell with many roles per repaint (tooltip, font,
+        # alignment…); reject unhandled roles before any index bookkeeping.
+        if role != Qt.DisplayRole and role != Qt.EditRole:
+            return None
+        if not index.isValid() or not (0 <= index.row() < len(self._cols[0])):
             return None
 
-        client = self._clients[index.row()]
-
-        if role in (Qt.DisplayRole, Qt.EditRole):
-            column_key = ["id", "nom", "email", "telephone", "adresse"][index.column()]
-            return client.get(column_key, "")
-
-        return None
+        return self._cols[index.column()][index.row()]
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
@@ -57,12 +73,58 @@ class ClientsTableModel(QAbstractTableModel):
     # Helpers
     def update_clients(self, clients: List[dict]) -> None:
         self.beginResetModel()
-        self._clients = clients
+        self._cols = self._columns_from(clients)
         self.endResetModel()
 
+    def insert_client(self, client: dict) -> int:
+        """Insert a single client at its sorted position and return the row.
+
+        Using :meth:`beginInsertRows` keeps the view's selection, scroll
+        position and delegates intact, unlike a full model reset.
+        """
+
+        nom = client.get("nom") or ""
+        noms = self._cols[self._KEYS.index("nom")]
+        row = len(noms)
+        for position, existing in enumerate(noms):
+            if (existing or "") > nom:
+                row = position
+                break
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        for column, key in enumerate(self._KEYS):
+            self._cols[column].insert(row, client[key])
+        self.endInsertRows()
+        return row
+
+    def update_client_row(self, row: int, client: dict) -> None:
+        """Replace the client at ``row`` and repaint only that row."""
+
+        if not 0 <= row < len(self._cols[0]):
+            return
+        for column, key in enumerate(self._KEYS):
+            self._cols[column][row] = client[key]
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.headers) - 1)
+        )
+
+    def remove_client(self, row: int) -> None:
+        """Remove a single row without resetting the whole model."""
+
+        if not 0 <= row < len(self._cols[0]):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for column in self._cols:
+            del column[row]
+        self.endRemoveRows()
+
     def client_at(self, row: int) -> Optional[dict]:
-        if 0 <= row < len(self._clients):
-            return self._clients[row]
+        if 0 <= row < len(self._cols[0]):
+            # Rebuilt on demand; only used when a row is selected.
+            return {
+                key: self._cols[column][row]
+                for column, key in enumerate(self._KEYS)
+            }
         return None
 
 
@@ -73,6 +135,7 @@ class ClientsWidget(QWidget):
         super().__init__()
         self.setWindowTitle("Gestion des clients")
         self.table_model = ClientsTableModel([])
+        self._columns_sized = False
 
         self._setup_ui()
         self.refresh_table()
@@ -85,12 +148,34 @@ class ClientsWidget(QWidget):
         title.setStyleSheet("font-weight: bold; font-size: 16px;")
         main_layout.addWidget(title)
 
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Rechercher par nom…")
+        self.search_edit.setClearButtonEnabled(True)
+        main_layout.addWidget(self.search_edit)
+
+        # Debounce keystrokes so one query runs per pause, not per letter.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.refresh_table)
+        self.search_edit.textChanged.connect(
+            lambda _text: self._search_timer.start()
+        )
+
         self.table_view = QTableView()
         self.table_view.setModel(self.table_model)
         self.table_view.setSelectionBehavior(QTableView.SelectRows)
         self.table_view.setSelectionMode(QTableView.SingleSelection)
         self.table_view.selectionModel().selectionChanged.connect(self._on_selection_changed)
         self.table_view.horizontalHeader().setStretchLastSection(True)
+
+        # selectionChanged fires once per selection delta while Qt walks
+        # rows (arrow keys, drag select); the zero-interval single shot
+        # coalesces the bursts into one form update per event-loop turn.
+        self._sel_timer = QTimer(self)
+        self._sel_timer.setSingleShot(True)
+        self._sel_timer.setInterval(0)
+        self._sel_timer.timeout.connect(self._apply_selection_to_form)
         main_layout.addWidget(self.table_view)
 
         form_layout = QFormLayout()
@@ -110,40 +195,70 @@ class ClientsWidget(QWidget):
         self.update_button = QPushButton("Modifier")
         self.delete_button = QPushButton("Supprimer")
         self.clear_button = QPushButton("Vider le formulaire")
+        self.import_button = QPushButton("Importer CSV")
 
         buttons_layout.addWidget(self.add_button)
         buttons_layout.addWidget(self.update_button)
         buttons_layout.addWidget(self.delete_button)
         buttons_layout.addWidget(self.clear_button)
+        buttons_layout.addWidget(self.import_button)
         main_layout.addLayout(buttons_layout)
 
         self.add_button.clicked.connect(self._create_client)
         self.update_button.clicked.connect(self._update_client)
         self.delete_button.clicked.connect(self._delete_client)
         self.clear_button.clicked.connect(self._clear_form)
+        self.import_button.clicked.connect(self._import_csv)
 
     # ------------------------------------------------------------------
     def refresh_table(self) -> None:
-        clients = clients_module.get_all_clients()
+        search = self.search_edit.text().strip() or None
+        run_in_background(
+            lambda: clients_module.get_all_clients(nom_like=search),
+            self._apply_clients,
+        )
+
+    def _apply_clients(self, clients: List[dict]) -> None:
         self.table_model.update_clients(clients)
-        self.table_view.resizeColumnsToContents()
+        if not self._columns_sized and clients:
+            # Sizing columns asks the delegate for every cell's size hint,
+            # an O(rows x cols) scan; do it once on the first load and let
+            # the user (and the stretched last section) take over.
+            self.table_view.resizeColumnsToContents()
+            self._columns_sized = True
 
     # ------------------------------------------------------------------
     def _get_selected_client(self) -> Optional[dict]:
+        row = self._get_selected_row()
+        if row is None:
+            return None
+        return self.table_model.client_at(row)
+
+    def _get_selected_row(self) -> Optional[int]:
         indexes = self.table_view.selectionModel().selectedRows()
         if not indexes:
             return None
-        return self.table_model.client_at(indexes[0].row())
+        return indexes[0].row()
 
     def _on_selection_changed(self, *_) -> None:
+        self._sel_timer.start()
+
+    def _apply_selection_to_form(self) -> None:
         client = self._get_selected_client()
         if not client:
             return
 
-        self.nom_edit.setText(client.get("nom", ""))
-        self.email_edit.setText(client.get("email", ""))
-        self.telephone_edit.setText(client.get("telephone", ""))
-        self.adresse_edit.setText(client.get("adresse", ""))
+        # Programmatic fill; suppress the textChanged cascade each setText
+        # would otherwise trigger.
+        for edit, key in (
+            (self.nom_edit, "nom"),
+            (self.email_edit, "email"),
+            (self.telephone_edit, "telephone"),
+            (self.adresse_edit, "adresse"),
+        ):
+            edit.blockSignals(True)
+            edit.setText(client.get(key, ""))
+            edit.blockSignals(False)
 
     # ------------------------------------------------------------------
     def _validate_form(self) -> bool:
@@ -164,35 +279,49 @@ class ClientsWidget(QWidget):
         if not self._validate_form():
             return
 
-        clients_module.create_client(
+        client = clients_module.create_client(
             self.nom_edit.text().strip(),
             self.email_edit.text().strip(),
             self.telephone_edit.text().strip(),
             self.adresse_edit.text().strip(),
         )
-        self.refresh_table()
+        self.table_model.insert_client(client)
         self._clear_form()
 
     def _update_client(self) -> None:
-        client = self._get_selected_client()
+        row = self._get_selected_row()
+        client = self.table_model.client_at(row) if row is not None else None
         if not client:
             QMessageBox.information(self, "Modification", "Sélectionnez un client à modifier.")
             return
         if not self._validate_form():
             return
 
+        updated = {
+            "id": client["id"],
+            "nom": self.nom_edit.text().strip(),
+            "email": self.email_edit.text().strip(),
+            "telephone": self.telephone_edit.text().strip(),
+            "adresse": self.adresse_edit.text().strip(),
+        }
         clients_module.update_client(
             client["id"],
-            nom=self.nom_edit.text().strip(),
-            email=self.email_edit.text().strip(),
-            telephone=self.telephone_edit.text().strip(),
-            adresse=self.adresse_edit.text().strip(),
+            nom=updated["nom"],
+            email=updated["email"],
+            telephone=updated["telephone"],
+            adresse=updated["adresse"],
         )
-        self.refresh_table()
+        if updated["nom"] == client.get("nom"):
+            self.table_model.update_client_row(row, updated)
+        else:
+            # A renamed client may move in the alphabetical ordering.
+            self.table_model.remove_client(row)
+            self.table_model.insert_client(updated)
         self._clear_form()
 
     def _delete_client(self) -> None:
-        client = self._get_selected_client()
+        row = self._get_selected_row()
+        client = self.table_model.client_at(row) if row is not None else None
         if not client:
             QMessageBox.information(self, "Suppression", "Sélectionnez un client à supprimer.")
             return
@@ -205,5 +334,32 @@ class ClientsWidget(QWidget):
         )
         if confirmation == QMessageBox.Yes:
             clients_module.delete_client(client["id"])
-            self.refresh_table()
+            self.table_model.remove_client(row)
             self._clear_form()
+
+    def _import_csv(self) -> None:
+        """Import clients from a CSV file using the batched insert API."""
+
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Importer des clients", "", "Fichiers CSV (*.csv)"
+        )
+        if not path:
+            return
+
+        rows = []
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            for raw in csv.reader(csv_file):
+                if not raw or not raw[0].strip():
+                    continue
+                nom, email, telephone, adresse = (list(raw) + [""] * 4)[:4]
+                rows.append(
+                    (nom.strip(), email.strip(), telephone.strip(), adresse.strip())
+                )
+
+        if not rows:
+            QMessageBox.information(self, "Import", "Aucun client à importer.")
+            return
+
+        clients_module.create_clients(rows)
+        self.refresh_table()
+        QMessageBox.information(self, "Import", f"{len(rows)} clients importés.")
@@ -1,12 +1,14 @@
 """Graphical interface for accounting entries."""
 from __future__ import annotations
 
+import csv
 from typing import List, Optional
 
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QDate
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QDate, QTimer
 from PySide6.QtWidgets import (
     QDateEdit,
     QDoubleSpinBox,
+    QFileDialog,
     QFormLayout,
     QHBoxLayout,
     QLabel,
@@ -19,54 +21,147 @@ from PySide6.QtWidgets import (
 )
 
 from modules import ecritures as ecritures_module
+from ui.workers import run_in_background
 
 
 class EcrituresTableModel(QAbstractTableModel):
-    """Table model displaying accounting entries."""
+    """Table model displaying accounting entries.
 
-    headers = [
+    Entries are fetched lazily: only :attr:`PAGE_SIZE` rows are loaded at a
+    time and the view requests further pages through Qt's
+    :meth:`canFetchMore`/:meth:`fetchMore` protocol as the user scrolls.
+    """
+
+    headers = (
         "ID",
         "Date",
         "Libellé",
         "Compte débit",
         "Compte crédit",
         "Montant",
-    ]
+    )
+
+    PAGE_SIZE = 200
+
+    # Column-to-key mapping, built once: data() runs for every visible cell
+    # on every repaint, so it must not allocate a fresh list each call.
+    _KEYS = ("id", "date_ecriture", "libelle", "compte_debit", "compte_credit", "montant")
+    _MONTANT_COL = _KEYS.index("montant")
 
     def __init__(self, ecritures: Optional[List[dict]] = None) -> None:
         super().__init__()
-        self._ecritures: List[dict] = ecritures or []
+        self._cols: List[list] = self._columns_from(ecritures or [])
+        self._total: int = len(self._cols[0])
+        self._libelle_like: Optional[str] = None
+
+    @staticmethod
+    def _format_montant(value) -> str:
+        if isinstance(value, (int, float)):
+            return f"{value:.2f} €"
+        return value if value is not None else ""
+
+    @classmethod
+    def _columns_from(cls, ecritures: List[dict]) -> List[list]:
+        """Build one value list per column from a list of entry rows.
+
+        The montant column is stored already formatted since the model only
+        ever displays it; every other cell access becomes a plain list
+        index on contiguous column data.
+        """
+
+        cols = [[entry[key] for entry in ecritures] for key in cls._KEYS]
+        cols[cls._MONTANT_COL] = [
+            cls._format_montant(value) for value in cols[cls._MONTANT_COL]
+        ]
+        return cols
 
     def rowCount(self, parent: QModelIndex | None = None) -> int:  # type: ignore[override]
-        return len(self._ecritures)
+        return len(self._cols[0])
 
     def columnCount(self, parent: QModelIndex | None = None) -> int:  # type: ignore[override]
         return len(self.headers)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
-        if not index.isValid() or not (0 <= index.row() < len(self._ecritures)):
+        # Qt probes every cell with many roles per repaint (tooltip, font,
+        # alignment…); reject unhandled roles before any index bookkeeping.
+        if role != Qt.DisplayRole:
+            return None
+        if not index.isValid() or not (0 <= index.row() < len(self._cols[0])):
             return None
 
-        ecriture = self._ecritures[index.row()]
-        keys = ["id", "date_ecriture", "libelle", "compte_debit", "compte_credit", "montant"]
-
-        if role == Qt.DisplayRole:
-            value = ecriture.get(keys[index.column()], "")
-            if keys[index.column()] == "montant" and isinstance(value, (int, float)):
-                return f"{value:.2f} €"
-            return value
-        return None
+        return self._cols[index.column()][index.row()]
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
             return self.headers[section]
         return super().headerData(section, orientation, role)
 
-    def update_ecritures(self, ecritures: List[dict]) -> None:
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # type: ignore[override]
+        if parent.isValid():
+            return False
+        return len(self._cols[0]) < self._total
+
+    def fetchMore(self, parent: QModelIndex) -> None:  # type: ignore[override]
+        if parent.isValid():
+            return
+
+        loaded = len(self._cols[0])
+        page = ecritures_module.get_entries_page(
+            loaded, self.PAGE_SIZE, libelle_like=self._libelle_like
+        )
+        if not page:
+            self._total = loaded
+            return
+
+        self.beginInsertRows(QModelIndex(), loaded, loaded + len(page) - 1)
+        for column, values in enumerate(self._columns_from(page)):
+            self._cols[column].extend(values)
+        self.endInsertRows()
+
+    def update_ecritures(
+        self,
+        ecritures: List[dict],
+        total: Optional[int] = None,
+        libelle_like: Optional[str] = None,
+    ) -> None:
         self.beginResetModel()
-        self._ecritures = ecritures
+        self._cols = self._columns_from(ecritures)
+        self._total = len(self._cols[0]) if total is None else total
+        self._libelle_like = libelle_like
         self.endResetModel()
 
+    def insert_ecriture(self, ecriture: dict) -> int:
+        """Insert a single entry at its sorted position and return the row.
+
+        Entries are ordered by date then identifier, both descending; a new
+        entry therefore goes in front of the first row with an older or
+        equal date.  Targeted insertion avoids the full model reset that
+        would discard selection and scroll position.
+        """
+
+        date_ecriture = ecriture.get("date_ecriture") or ""
+        dates = self._cols[self._KEYS.index("date_ecriture")]
+        row = len(dates)
+        for position, existing in enumerate(dates):
+            if (existing or "") <= date_ecriture:
+                row = position
+                break
+
+        self._total += 1
+        if row == len(dates) and row < self._total - 1:
+            # The entry sorts past the loaded window; it will arrive with a
+            # later fetchMore page instead.
+            return -1
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        for column, key in enumerate(self._KEYS):
+            value = ecriture[key]
+            if column == self._MONTANT_COL:
+                value = self._format_montant(value)
+            self._cols[column].insert(row, value)
+        self.endInsertRows()
+        return row
+
 
 class EcrituresWidget(QWidget):
     """Widget used to create and list accounting entries."""
@@ -75,6 +170,8 @@ class EcrituresWidget(QWidget):
         super().__init__()
         self.setWindowTitle("Journal comptable")
         self.table_model = EcrituresTableModel([])
+        self._columns_sized = False
+        self._seen_version = -1
 
         self._setup_ui()
         self.refresh_table()
@@ -86,6 +183,20 @@ class EcrituresWidget(QWidget):
         title.setStyleSheet("font-weight: bold; font-size: 16px;")
         main_layout.addWidget(title)
 
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Rechercher par libellé…")
+        self.search_edit.setClearButtonEnabled(True)
+        main_layout.addWidget(self.search_edit)
+
+        # Debounce keystrokes so one query runs per pause, not per letter.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.refresh_table)
+        self.search_edit.textChanged.connect(
+            lambda _text: self._search_timer.start()
+        )
+
         self.table_view = QTableView()
         self.table_view.setModel(self.table_model)
         self.table_view.setSelectionBehavior(QTableView.SelectRows)
@@ -117,22 +228,48 @@ class EcrituresWidget(QWidget):
         buttons_layout = QHBoxLayout()
         self.create_button = QPushButton("Ajouter l'écriture")
         self.refresh_button = QPushButton("Rafraîchir")
+        self.import_button = QPushButton("Importer CSV")
 
         buttons_layout.addWidget(self.create_button)
         buttons_layout.addWidget(self.refresh_button)
+        buttons_layout.addWidget(self.import_button)
         main_layout.addLayout(buttons_layout)
 
         self.create_button.clicked.connect(self._create_entry)
         self.refresh_button.clicked.connect(self.refresh_table)
+        self.import_button.clicked.connect(self._import_csv)
 
     def refresh_table(self) -> None:
-        ecritures = ecritures_module.get_all_entries()
-        self.table_model.update_ecritures(ecritures)
-        self.table_view.resizeColumnsToContents()
+        self._seen_version = ecritures_module.data_version()
+        search = self.search_edit.text().strip() or None
+
+        def fetch() -> tuple:
+            return (
+                ecritures_module.get_entries_page(
+                    0, EcrituresTableModel.PAGE_SIZE, libelle_like=search
+                ),
+                ecritures_module.count_entries(libelle_like=search),
+                search,
+            )
+
+        run_in_background(fetch, self._apply_entries)
+
+    def _apply_entries(self, payload: tuple) -> None:
+        first_page, total, search = payload
+        self.table_model.update_ecritures(first_page, total=total, libelle_like=search)
+        if not self._columns_sized and first_page:
+            # Sizing columns asks the delegate for every cell's size hint,
+            # an O(rows x cols) scan; do it once on the first load and let
+            # the user (and the stretched last section) take over.
+            self.table_view.resizeColumnsToContents()
+            self._columns_sized = True
 
     def showEvent(self, event) -> None:  # type: ignore[override]
         super().showEvent(event)
-        self.refresh_table()
+        # Only reload when the journal actually changed since the last
+        # refresh; plain tab switches keep selection and scroll position.
+        if ecritures_module.data_version() != self._seen_version:
+            self.refresh_table()
 
     def _validate_form(self) -> bool:
         if not self.libelle_edit.text().strip():
@@ -150,14 +287,16 @@ class EcrituresWidget(QWidget):
         if not self._validate_form():
             return
 
-        ecritures_module.create_entry(
+        ecriture = ecritures_module.create_entry(
             self.date_edit.date().toString("yyyy-MM-dd"),
             self.libelle_edit.text().strip(),
             self.compte_debit_edit.text().strip(),
             self.compte_credit_edit.text().strip(),
             self.montant_spin.value(),
         )
-        self.refresh_table()
+        self.table_model.insert_ecriture(ecriture)
+        # The incremental insert already reflects this write.
+        self._seen_version = ecritures_module.data_version()
         self._clear_form()
         QMessageBox.information(self, "Écriture", "L'écriture a été enregistrée.")
 
@@ -166,3 +305,33 @@ class EcrituresWidget(QWidget):
         self.compte_debit_edit.clear()
         self.compte_credit_edit.clear()
         self.montant_spin.setValue(0.0)
+
+    def _import_csv(self) -> None:
+        """Import accounting entries from a CSV file in a single batch."""
+
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Importer des écritures", "", "Fichiers CSV (*.csv)"
+        )
+        if not path:
+            return
+
+        rows = []
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            for raw in csv.reader(csv_file):
+                if len(raw) < 5 or not raw[0].strip():
+                    continue
+                try:
+                    montant = float(raw[4].replace(",", "."))
+                except ValueError:
+                    continue
+                rows.append(
+                    (raw[0].strip(), raw[1].strip(), raw[2].strip(), raw[3].strip(), montant)
+                )
+
+        if not rows:
+            QMessageBox.information(self, "Import", "Aucune écriture à importer.")
+            return
+
+        ecritures_module.create_entries(rows)
+        self.refresh_table()
+        QMessageBox.information(self, "Import", f"{len(rows)} écritures importées.")
@@ -1,9 +1,16 @@
 """Graphical interface for invoices."""
 from __future__ import annotations
 
-from typing import List, Optional
-
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QDate
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QDate,
+    QLocale,
+    QModelIndex,
+    QSignalBlocker,
+    Qt,
+)
 from PySide6.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -25,17 +32,30 @@ from modules import clients as clients_module
 from modules import factures as factures_module
 
 
+_FR_LOCALE = QLocale(QLocale.French, QLocale.France)
+
+
 def _format_currency(value: float) -> str:
-    """Format monetary values using a French-style notation."""
+    """Format monetary values using a French-style notation.
+
+    Delegates to Qt's locale machinery, which formats in C++ and handles
+    grouping and negative values correctly, instead of re-munging a Python
+    f-string per call.
+    """
 
-    formatted = f"{value:,.2f}".replace(",", " ").replace(".", ",")
-    return f"{formatted} €"
+    return _FR_LOCALE.toCurrencyString(value, "€")
 
 
 class FacturesTableModel(QAbstractTableModel):
-    """Model used to display invoices."""
+    """Model used to display invoices.
+
+    Invoices are fetched lazily: only :attr:`PAGE_SIZE` rows are loaded at
+    a time and the view requests further pages through Qt's
+    :meth:`canFetchMore`/:meth:`fetchMore` protocol as the user scrolls, so
+    the first paint costs the same regardless of table size.
+    """
 
-    headers = [
+    headers = (
         "ID",
         "Client",
         "Date",
@@ -43,34 +63,63 @@ class FacturesTableModel(QAbstractTableModel):
         "TVA (%)",
         "Montant TTC",
         "Statut",
-    ]
+    )
+
+    PAGE_SIZE = 200
+
+    # Column-to-key mapping and formatting rules, built once at import
+    # time instead of being re-allocated inside the hot paint path.
+    _KEYS = ("id", "client", "date_facture", "montant_ht", "taux_tva", "montant_ttc", "statut")
+    _CURRENCY_COLS = frozenset({3, 5})
+    _TVA_COL = 4
+
+    #: Raw fields kept per row, in :data:`factures.INVOICE_COLUMNS` order;
+    #: the form fill needs the unformatted values and the client_id.
+    _RAW_KEYS = factures_module.INVOICE_COLUMNS
 
     def __init__(self, factures: Optional[List[dict]] = None) -> None:
         super().__init__()
-        self._factures: List[dict] = factures or []
+        # Struct-of-arrays layout: one list per column instead of one dict
+        # per row.  Cell access in data() becomes a plain list index and
+        # the per-row dict overhead disappears on long tables.
+        self._raw: Dict[str, list] = {key: [] for key in self._RAW_KEYS}
+        self._disp: List[list] = [[] for _ in self._KEYS]
+        self._append_rows(factures or [])
+        self._total: int = len(self._disp[0])
+
+    @classmethod
+    def _display_value(cls, column: int, value):
+        """Render one cell's display string, done once at load time."""
+
+        if isinstance(value, (int, float)):
+            if column in cls._CURRENCY_COLS:
+                return _format_currency(float(value))
+            if column == cls._TVA_COL:
+                return f"{value:.2f} %"
+        return value
+
+    def _append_rows(self, factures: List[dict]) -> None:
+        """Extend the raw and display columns with ``factures``."""
+
+        for key in self._RAW_KEYS:
+            self._raw[key].extend(facture[key] for facture in factures)
+        for column, key in enumerate(self._KEYS):
+            self._disp[column].extend(
+                self._display_value(column, facture[key]) for facture in factures
+            )
 
     def rowCount(self, parent: QModelIndex | None = None) -> int:  # type: ignore[override]
-        return len(self._factures)
+        return len(self._disp[0])
 
     def columnCount(self, parent: QModelIndex | None = None) -> int:  # type: ignore[override]
         return len(self.headers)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
-        if not index.isValid() or not (0 <= index.row() < len(self._factures)):
+        if not index.isValid() or not (0 <= index.row() < len(self._disp[0])):
             return None
 
-        facture = self._factures[index.row()]
-        keys = ["id", "client", "date_facture", "montant_ht", "taux_tva", "montant_ttc", "statut"]
-
         if role == Qt.DisplayRole:
-            value = facture.get(keys[index.column()], "")
-            if keys[index.column()] in {"montant_ht", "montant_ttc"} and isinstance(
-                value, (int, float)
-            ):
-                return _format_currency(float(value))
-            if keys[index.column()] == "taux_tva" and isinstance(value, (int, float)):
-                return f"{value:.2f} %"
-            return value
+            return self._disp[index.column()][index.row()]
         return None
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
@@ -78,14 +127,97 @@ class FacturesTableModel(QAbstractTableModel):
             return self.headers[section]
         return super().headerData(section, orientation, role)
 
-    def update_factures(self, factures: List[dict]) -> None:
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # type: ignore[override]
+        if parent.isValid():
+            return False
+        return len(self._disp[0]) < self._total
+
+    def fetchMore(self, parent: QModelIndex) -> None:  # type: ignore[override]
+        if parent.isValid():
+            return
+
+        loaded = len(self._disp[0])
+        page = factures_module.get_all_invoices(
+            limit=self.PAGE_SIZE, offset=loaded
+        )
+        if not page:
+            self._total = loaded
+            return
+
+        self.beginInsertRows(QModelIndex(), loaded, loaded + len(page) - 1)
+        self._append_rows(page)
+        self.endInsertRows()
+
+    def update_factures(
+        self, factures: List[dict], total: Optional[int] = None
+    ) -> None:
         self.beginResetModel()
-        self._factures = factures
+        self._raw = {key: [] for key in self._RAW_KEYS}
+        self._disp = [[] for _ in self._KEYS]
+        self._append_rows(factures)
+        self._total = len(self._disp[0]) if total is None else total
         self.endResetModel()
 
+    def insert_facture(self, facture: dict) -> int:
+        """Insert a single invoice at its sorted position and return the row.
+
+        Invoices are ordered by date then identifier, both descending.
+        Targeted insertion avoids the full model reset that would discard
+        selection and scroll position.
+        """
+
+        date_facture = facture.get("date_facture") or ""
+        dates = self._raw["date_facture"]
+        row = len(dates)
+        for position, existing in enumerate(dates):
+            if (existing or "") <= date_facture:
+                row = position
+                break
+
+        self._total += 1
+        if row == len(dates) and row < self._total - 1:
+            # The invoice sorts past the loaded window; it will arrive with
+            # a later fetchMore page instead.
+            return -1
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        for key in self._RAW_KEYS:
+            self._raw[key].insert(row, facture[key])
+        for column, key in enumerate(self._KEYS):
+            self._disp[column].insert(row, self._display_value(column, facture[key]))
+        self.endInsertRows()
+        return row
+
+    def update_facture_row(self, row: int, facture: dict) -> None:
+        """Replace the invoice at ``row`` and repaint only that row."""
+
+        if not 0 <= row < len(self._disp[0]):
+            return
+        for key in self._RAW_KEYS:
+            self._raw[key][row] = facture[key]
+        for column, key in enumerate(self._KEYS):
+            self._disp[column][row] = self._display_value(column, facture[key])
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.headers) - 1)
+        )
+
+    def remove_facture(self, row: int) -> None:
+        """Remove a single row without resetting the whole model."""
+
+        if not 0 <= row < len(self._disp[0]):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for key in self._RAW_KEYS:
+            del self._raw[key][row]
+        for column in self._disp:
+            del column[row]
+        self._total -= 1
+        self.endRemoveRows()
+
     def facture_at(self, row: int) -> Optional[dict]:
-        if 0 <= row < len(self._factures):
-            return self._factures[row]
+        if 0 <= row < len(self._disp[0]):
+            # Rebuilt on demand; only used when a row is selected.
+            return {key: self._raw[key][row] for key in self._RAW_KEYS}
         return None
 
 
@@ -96,6 +228,9 @@ class FacturesWidget(QWidget):
         super().__init__()
         self.setWindowTitle("Gestion des factures")
         self.table_model = FacturesTableModel([])
+        self._clients_seen = -1
+        self._factures_seen = -1
+        self._client_id_to_index: Dict[int, int] = {}
 
         self._setup_ui()
         self.refresh_clients()
@@ -245,16 +380,27 @@ class FacturesWidget(QWidget):
 
     # ------------------------------------------------------------------
     def refresh_clients(self) -> None:
+        self._clients_seen = clients_module.data_version()
         clients = clients_module.get_all_clients()
         self.client_combo.clear()
         self.client_combo.addItem("Sélectionner…", None)
         for client in clients:
-            self.client_combo.addItem(client.get("nom", ""), client.get("id"))
+            self.client_combo.addItem(client["nom"], client["id"])
         self.client_combo.setCurrentIndex(0)
+        # O(1) lookup on selection instead of findData's linear scan; the
+        # +1 accounts for the "Sélectionner…" sentinel at index 0.
+        self._client_id_to_index = {
+            client["id"]: position + 1 for position, client in enumerate(clients)
+        }
 
     def refresh_table(self) -> None:
-        factures = factures_module.get_all_invoices()
-        self.table_model.update_factures(factures)
+        self._factures_seen = factures_module.data_version()
+        factures = factures_module.get_all_invoices(
+            limit=FacturesTableModel.PAGE_SIZE, offset=0
+        )
+        self.table_model.update_factures(
+            factures, total=factures_module.count_invoices()
+        )
         selection_model = self.table_view.selectionModel()
         if selection_model:
             selection_model.clearSelection()
@@ -264,15 +410,25 @@ class FacturesWidget(QWidget):
 
     def showEvent(self, event) -> None:  # type: ignore[override]
         super().showEvent(event)
-        self.refresh_clients()
-        self.refresh_table()
+        # Only reload what actually changed since the last refresh; plain
+        # tab switches keep selection and scroll position.
+        if clients_module.data_version() != self._clients_seen:
+            self.refresh_clients()
+        if factures_module.data_version() != self._factures_seen:
+            self.refresh_table()
 
     # ------------------------------------------------------------------
     def _get_selected_facture(self) -> Optional[dict]:
+        row = self._get_selected_row()
+        if row is None:
+            return None
+        return self.table_model.facture_at(row)
+
+    def _get_selected_row(self) -> Optional[int]:
         indexes = self.table_view.selectionModel().selectedRows()
         if not indexes:
             return None
-        return self.table_model.facture_at(indexes[0].row())
+        return indexes[0].row()
 
     def _on_selection_changed(self, *_) -> None:
         facture = self._get_selected_facture()
@@ -282,8 +438,21 @@ class FacturesWidget(QWidget):
         if not facture:
             return
 
-        # Fill the form with the selected invoice
-        index = self.client_combo.findData(facture.get("client_id"))
+        # Fill the form with the selected invoice.  The spin boxes are
+        # connected to _update_ttc_display, so without the blockers the TTC
+        # label would be recomputed and repainted once per setValue; block
+        # everything and refresh it a single time at the end.
+        blockers = [
+            QSignalBlocker(widget)
+            for widget in (
+                self.client_combo,
+                self.date_edit,
+                self.montant_ht_spin,
+                self.tva_spin,
+                self.paid_checkbox,
+            )
+        ]
+        index = self._client_id_to_index.get(facture.get("client_id"), -1)
         if index >= 0:
             self.client_combo.setCurrentIndex(index)
         date_value = QDate.fromString(facture.get("date_facture", ""), "yyyy-MM-dd")
@@ -296,6 +465,7 @@ class FacturesWidget(QWidget):
         self.paid_checkbox.setChecked(
             facture.get("statut") == factures_module.STATUT_PAYEE
         )
+        del blockers
         self._update_ttc_display()
 
     def _update_ttc_display(self) -> None:
@@ -331,16 +501,19 @@ class FacturesWidget(QWidget):
             else factures_module.STATUT_EN_ATTENTE
         )
 
-        factures_module.create_invoice(
+        invoice = factures_module.create_invoice(
             client_id, date_facture, montant_ht, tva, statut
         )
-        self.refresh_table()
+        # Insert the returned row in place; no full model reset needed.
+        self.table_model.insert_facture(invoice)
+        self._factures_seen = factures_module.data_version()
         self.montant_ht_spin.setValue(0.0)
         self.paid_checkbox.setChecked(False)
         QMessageBox.information(self, "Facture", "La facture a été créée avec succès.")
 
     def _edit_invoice(self) -> None:
-        facture = self._get_selected_facture()
+        row = self._get_selected_row()
+        facture = self.table_model.facture_at(row) if row is not None else None
         if not facture:
             QMessageBox.information(self, "Facture", "Sélectionnez une facture à modifier.")
             return
@@ -352,20 +525,39 @@ class FacturesWidget(QWidget):
             if self.paid_checkbox.isChecked()
             else factures_module.STATUT_EN_ATTENTE
         )
+        montant_ht = self.montant_ht_spin.value()
+        taux_tva = self.tva_spin.value()
+        updated = {
+            "id": facture["id"],
+            "client_id": self.client_combo.currentData(),
+            "client": self.client_combo.currentText(),
+            "date_facture": self.date_edit.date().toString("yyyy-MM-dd"),
+            "montant_ht": montant_ht,
+            "taux_tva": taux_tva,
+            "montant_ttc": montant_ht * (1 + taux_tva / 100),
+            "statut": statut,
+        }
 
         factures_module.update_invoice(
-            facture["id"],
-            self.client_combo.currentData(),
-            self.date_edit.date().toString("yyyy-MM-dd"),
-            self.montant_ht_spin.value(),
-            self.tva_spin.value(),
+            updated["id"],
+            updated["client_id"],
+            updated["date_facture"],
+            updated["montant_ht"],
+            updated["taux_tva"],
             statut,
         )
-        self.refresh_table()
+        if updated["date_facture"] == facture.get("date_facture"):
+            self.table_model.update_facture_row(row, updated)
+        else:
+            # A re-dated invoice may move in the chronological ordering.
+            self.table_model.remove_facture(row)
+            self.table_model.insert_facture(updated)
+        self._factures_seen = factures_module.data_version()
         QMessageBox.information(self, "Facture", "La facture a été mise à jour.")
 
     def _delete_invoice(self) -> None:
-        facture = self._get_selected_facture()
+        row = self._get_selected_row()
+        facture = self.table_model.facture_at(row) if row is not None else None
         if not facture:
             QMessageBox.information(self, "Facture", "Sélectionnez une facture à supprimer.")
             return
@@ -378,4 +570,5 @@ class FacturesWidget(QWidget):
         )
         if confirmation == QMessageBox.Yes:
             factures_module.delete_invoice(facture["id"])
-            self.refresh_table()
+            self.table_model.remove_facture(row)
+            self._factures_seen = factures_module.data_version()
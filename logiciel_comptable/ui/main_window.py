@@ -1,12 +1,12 @@
 """Main application window containing navigation between modules."""
 from __future__ import annotations
 
-from typing import Dict
+from functools import partial
+from typing import Callable, Dict
 
-from PySide6.QtCore import QSize, Qt
+from PySide6.QtCore import QCoreApplication, QSize, Qt
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
-    QApplication,
     QFrame,
     QHBoxLayout,
     QLabel,
@@ -18,9 +18,50 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ui.clients_ui import ClientsWidget
-from ui.factures_ui import FacturesWidget
-from ui.ecritures_ui import EcrituresWidget
+# Parsed once by Qt's style engine when applied to the window, instead of
+# one CSS parse per button; the [nav="true"] selector scopes it to the
+# sidebar navigation buttons.
+NAV_BUTTON_QSS = """
+QPushButton[nav="true"] {
+    text-align: left;
+    padding: 10px 14px;
+    border-radius: 10px;
+    font-size: 15px;
+    color: #2f2f35;
+    background-color: transparent;
+}
+QPushButton[nav="true"]:hover {
+    background-color: rgba(52, 120, 246, 0.08);
+}
+QPushButton[nav="true"]:checked {
+    background-color: #3478f6;
+    color: white;
+}
+QPushButton[nav="true"]:checked:hover {
+    background-color: #2967d1;
+}
+"""
+
+
+# Imported lazily inside the factories: each module widget pulls in its
+# own PySide6 widgets and database modules, so tabs the user never opens
+# cost nothing at startup.
+def _make_clients_widget() -> QWidget:
+    from ui.clients_ui import ClientsWidget
+
+    return ClientsWidget()
+
+
+def _make_factures_widget() -> QWidget:
+    from ui.factures_ui import FacturesWidget
+
+    return FacturesWidget()
+
+
+def _make_ecritures_widget() -> QWidget:
+    from ui.ecritures_ui import EcrituresWidget
+
+    return EcrituresWidget()
 
 
 class MainWindow(QMainWindow):
@@ -34,11 +75,29 @@ class MainWindow(QMainWindow):
         self._stacked_widget: QStackedWidget | None = None
         self._module_title: QLabel | None = None
         self._nav_buttons: Dict[str, QPushButton] = {}
+        self._icon_cache: Dict[QStyle.StandardPixmap, QIcon] = {}
+
+        # Module widgets are built on the first navigation that needs
+        # them, then cached; the stack only ever contains built modules.
+        self._module_factories: Dict[str, Callable[[], QWidget]] = {
+            "factures": _make_factures_widget,
+            "clients": _make_clients_widget,
+            "ecritures": _make_ecritures_widget,
+        }
+        self._modules: Dict[str, QWidget] = {}
+        # setCurrentWidget does a linear indexOf scan over the stack;
+        # remember each widget's index at insertion and switch by index.
+        self._widget_index: Dict[QWidget, int] = {}
+        self._active_module: str | None = None
+        # Built once; _set_active_module runs on every click and should
+        # not re-allocate its lookup table each time.
+        self._module_titles: Dict[str, str] = {
+            "factures": "Factures",
+            "clients": "Clients",
+            "ecritures": "Comptabilité",
+        }
 
-        self._clients_widget = ClientsWidget()
-        self._factures_widget = FacturesWidget()
-        self._ecritures_widget = EcrituresWidget()
-
+        self.setStyleSheet(NAV_BUTTON_QSS)
         self._setup_ui()
         self._set_active_module("factures")
 
@@ -83,37 +142,45 @@ class MainWindow(QMainWindow):
         layout.addSpacing(12)
 
         self._nav_buttons["clients"] = self._create_nav_button(
-            "Clients", self.style().standardIcon(QStyle.SP_FileIcon)
+            "Clients", self._std_icon(QStyle.SP_FileIcon)
         )
         self._nav_buttons["factures"] = self._create_nav_button(
-            "Factures", self.style().standardIcon(QStyle.SP_DriveHDIcon)
+            "Factures", self._std_icon(QStyle.SP_DriveHDIcon)
         )
         self._nav_buttons["ecritures"] = self._create_nav_button(
-            "Comptabilité", self.style().standardIcon(QStyle.SP_ComputerIcon)
+            "Comptabilité", self._std_icon(QStyle.SP_ComputerIcon)
         )
         self._nav_buttons["quit"] = self._create_nav_button(
-            "Quitter", self.style().standardIcon(QStyle.SP_DialogCloseButton)
+            "Quitter", self._std_icon(QStyle.SP_DialogCloseButton)
         )
 
         for key in ("clients", "factures", "ecritures"):
             layout.addWidget(self._nav_buttons[key])
+            self._nav_buttons[key].clicked.connect(
+                partial(self._set_active_module, key)
+            )
 
         layout.addStretch(1)
         layout.addWidget(self._nav_buttons["quit"])
-
-        self._nav_buttons["clients"].clicked.connect(
-            lambda: self._set_active_module("clients")
-        )
-        self._nav_buttons["factures"].clicked.connect(
-            lambda: self._set_active_module("factures")
-        )
-        self._nav_buttons["ecritures"].clicked.connect(
-            lambda: self._set_active_module("ecritures")
-        )
-        self._nav_buttons["quit"].clicked.connect(self._quit_application)
+        # Static C++ slot; no Python trampoline needed on the quit path.
+        self._nav_buttons["quit"].clicked.connect(QCoreApplication.quit)
 
         return sidebar
 
+    def _std_icon(self, pixmap: QStyle.StandardPixmap) -> QIcon:
+        """Return a standard icon, building each one at most once.
+
+        Every standardIcon call goes through the style plugin and
+        allocates a fresh QIcon; the cache keeps one per pixmap for the
+        window's lifetime.
+        """
+
+        icon = self._icon_cache.get(pixmap)
+        if icon is None:
+            icon = self.style().standardIcon(pixmap)
+            self._icon_cache[pixmap] = icon
+        return icon
+
     def _create_nav_button(self, text: str, icon: QIcon) -> QPushButton:
         button = QPushButton(text)
         button.setCheckable(True)
@@ -121,28 +188,8 @@ class MainWindow(QMainWindow):
         button.setIconSize(QSize(22, 22))
         button.setCursor(Qt.PointingHandCursor)
         button.setMinimumHeight(42)
-        button.setStyleSheet(
-            """
-            QPushButton {
-                text-align: left;
-                padding: 10px 14px;
-                border-radius: 10px;
-                font-size: 15px;
-                color: #2f2f35;
-                background-color: transparent;
-            }
-            QPushButton:hover {
-                background-color: rgba(52, 120, 246, 0.08);
-            }
-            QPushButton:checked {
-                background-color: #3478f6;
-                color: white;
-            }
-            QPushButton:checked:hover {
-                background-color: #2967d1;
-            }
-            """
-        )
+        # Styled by NAV_BUTTON_QSS, applied once on the window.
+        button.setProperty("nav", True)
         return button
 
     # ------------------------------------------------------------------
@@ -169,33 +216,40 @@ class MainWindow(QMainWindow):
         layout.addWidget(self._module_title)
 
         self._stacked_widget = QStackedWidget()
-        self._stacked_widget.addWidget(self._factures_widget)
-        self._stacked_widget.addWidget(self._clients_widget)
-        self._stacked_widget.addWidget(self._ecritures_widget)
         layout.addWidget(self._stacked_widget, 1)
 
         return container
 
+    # ------------------------------------------------------------------
+    def _ensure_module(self, module: str) -> QWidget:
+        """Return the widget for ``module``, building it on first use."""
+
+        widget = self._modules.get(module)
+        if widget is None:
+            widget = self._module_factories[module]()
+            self._modules[module] = widget
+            self._widget_index[widget] = self._stacked_widget.addWidget(widget)
+        return widget
+
     # ------------------------------------------------------------------
     def _set_active_module(self, module: str) -> None:
         if not self._stacked_widget or not self._module_title:
             return
 
-        mapping = {
-            "factures": (self._factures_widget, "Factures"),
-            "clients": (self._clients_widget, "Clients"),
-            "ecritures": (self._ecritures_widget, "Comptabilité"),
-        }
-
-        widget, title = mapping.get(module, (self._factures_widget, "Factures"))
-        self._stacked_widget.setCurrentWidget(widget)
-        self._module_title.setText(title)
+        if module not in self._module_factories:
+            module = "factures"
+        if module == self._active_module:
+            # Clicking the already-active button must not uncheck it.
+            self._nav_buttons[module].setChecked(True)
+            return
 
-        for key, button in self._nav_buttons.items():
-            button.setChecked(key == module)
+        widget = self._ensure_module(module)
+        self._stacked_widget.setCurrentIndex(self._widget_index[widget])
+        self._module_title.setText(self._module_titles[module])
 
-    # ------------------------------------------------------------------
-    def _quit_application(self) -> None:
-        app = QApplication.instance()
-        if app is not None:
-            app.quit()
+        # Each setChecked invalidates the button's style, so only touch
+        # the two buttons whose state actually changes.
+        if self._active_module is not None:
+            self._nav_buttons[self._active_module].setChecked(False)
+        self._nav_buttons[module].setChecked(True)
+        self._active_module = module
@@ -0,0 +1,47 @@
+"""Background helpers to run database work off the Qt main thread."""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by :class:`FetchWorker`.
+
+    :class:`~PySide6.QtCore.QRunnable` is not a :class:`QObject`, so the
+    signal lives on this small carrier object instead.
+    """
+
+    result = Signal(object)
+
+
+class FetchWorker(QRunnable):
+    """Run a fetch callable on the global thread pool.
+
+    The return value is delivered through the queued ``result`` signal, so
+    the receiving slot always runs back on the Qt event loop.
+    """
+
+    def __init__(self, fetch: Callable[[], Any]) -> None:
+        super().__init__()
+        self._fetch = fetch
+        self.signals = WorkerSignals()
+
+    @Slot()
+    def run(self) -> None:  # type: ignore[override]
+        self.signals.result.emit(self._fetch())
+
+
+def run_in_background(
+    fetch: Callable[[], Any], on_result: Callable[[Any], None]
+) -> None:
+    """Execute ``fetch`` in a worker thread and pass its result to ``on_result``.
+
+    Keeps disk and commit latency off the event loop so the UI never blocks
+    on SQLite while a table refresh is in flight.
+    """
+
+    worker = FetchWorker(fetch)
+    worker.signals.result.connect(on_result)
+    QThreadPool.globalInstance().start(worker)
@@ -4,12 +4,19 @@ This module exposes a :class:`DBManager` class offering a small helper API to
 initialise the application database and to execute SQL queries.  A single
 instance named :data:`db_manager` is created so the rest of the code base can
 share the same connection easily.
+
+The connection runs in WAL journal mode, which creates ``-wal`` and ``-shm``
+sidecar files next to the database file.  They belong to SQLite and must be
+kept alongside ``database.db``.
 """
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
+import queue
 import sqlite3
-from typing import Any, Iterable, Optional
+import threading
+from typing import Any, Iterable, Iterator, Optional
 
 
 class DBManager:
@@ -18,11 +25,26 @@ class DBManager:
     The manager keeps a persistent connection to the database file.  It also
     ensures the schema exists on start-up and exposes a convenience
     :meth:`execute` method to run SQL statements in a concise fashion.
+
+    The manager is safe to share between the Qt main thread and worker
+    threads: connections are opened with ``check_same_thread=False``, all
+    writes serialise on an internal lock, and reads run on a pool of
+    read-only connections that WAL mode serves concurrently with the
+    writer.
     """
 
+    #: Maximum number of pooled read-only connections.
+    _MAX_READERS = 4
+
     def __init__(self, database_path: Path | str) -> None:
         self.database_path = Path(database_path)
         self._connection: Optional[sqlite3.Connection] = None
+        # The connection is shared between the Qt main thread and the
+        # fetch workers; the lock serialises access to it.
+        self._lock = threading.Lock()
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
         self.initialize_database()
 
     # ------------------------------------------------------------------
@@ -30,32 +52,115 @@ class DBManager:
     def get_connection(self) -> sqlite3.Connection:
         """Return an open SQLite connection.
 
-        The first call opens the database and activates foreign key support.
+        The first call opens the database, activates foreign key support and
+        applies the performance PRAGMAs: WAL journaling avoids the rollback
+        journal double-write, ``synchronous=NORMAL`` halves the fsyncs per
+        commit and the larger page cache keeps the listing queries in memory.
         Subsequent calls reuse the same connection object.
         """
 
         if self._connection is None:
-            self._connection = sqlite3.connect(self.database_path)
+            # A larger statement cache lets sqlite3 reuse the compiled form
+            # of the small CRUD queries the UI repeats constantly instead of
+            # re-parsing and re-planning them on every call.
+            # detect_types stays off explicitly: column-name type parsing
+            # would add a per-row scan for converters we never register.
+            self._connection = sqlite3.connect(
+                self.database_path,
+                cached_statements=512,
+                detect_types=0,
+                check_same_thread=False,
+            )
             self._connection.row_factory = sqlite3.Row
+            # Page size and auto_vacuum only take effect while the file is
+            # still empty, and must be set before WAL fixes the page size:
+            # 8 KiB pages flatten the index B-trees a little, and
+            # incremental auto-vacuum keeps the file from bloating over
+            # years of use.  On an existing database both are no-ops.
+            self._connection.execute("PRAGMA page_size = 8192")
+            self._connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
             self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute("PRAGMA temp_store = MEMORY")
+            self._connection.execute("PRAGMA cache_size = -64000")
+            # Memory-map the database file (up to 256 MB) so reads hit the
+            # OS page cache without an extra copy through SQLite's buffers.
+            self._connection.execute("PRAGMA mmap_size = 268435456")
         return self._connection
 
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open one read-only connection for the pool."""
+
+        conn = sqlite3.connect(
+            f"file:{self.database_path}?mode=ro",
+            uri=True,
+            cached_statements=512,
+            detect_types=0,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -64000")
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool.
+
+        With WAL enabled SQLite serves many readers concurrently with the
+        single writer, so background fetches do not queue behind commits on
+        the shared read-write connection.  Connections are opened lazily,
+        up to :data:`_MAX_READERS`, and always returned to the pool.
+        """
+
+        conn: Optional[sqlite3.Connection]
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                if self._reader_count < self._MAX_READERS:
+                    self._reader_count += 1
+                    conn = None
+                else:
+                    conn = self._readers.get()
+            if conn is None:
+                conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
     def close(self) -> None:
-        """Close the current connection if it exists."""
+        """Close the current connection and the reader pool."""
 
         if self._connection is not None:
+            # Hand back up to 100 free pages accumulated since the last
+            # shutdown, and let SQLite refresh whatever statistics this
+            # session's queries showed to be stale; both cost a few
+            # milliseconds on a database this size.
+            self._connection.execute("PRAGMA incremental_vacuum(100)")
+            self._connection.execute("PRAGMA optimize")
             self._connection.close()
             self._connection = None
 
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        self._reader_count = 0
+
     # ------------------------------------------------------------------
     # Schema setup
     def initialize_database(self) -> None:
         """Create database tables when they are missing."""
 
         conn = self.get_connection()
-        cursor = conn.cursor()
 
-        cursor.execute(
+        # One executescript call compiles and runs the whole DDL batch in
+        # a single pass instead of one Python->C crossing per statement.
+        conn.executescript(
             """
             CREATE TABLE IF NOT EXISTS clients (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -63,27 +168,21 @@ class DBManager:
                 email TEXT,
                 telephone TEXT,
                 adresse TEXT
-            )
-            """
-        )
+            );
 
-        cursor.execute(
-            """
             CREATE TABLE IF NOT EXISTS factures (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 client_id INTEGER NOT NULL,
                 date_facture TEXT NOT NULL,
                 montant_ht REAL NOT NULL,
                 taux_tva REAL NOT NULL,
-                montant_ttc REAL NOT NULL,
+                montant_ttc REAL GENERATED ALWAYS AS
+                    (montant_ht * (1 + taux_tva / 100.0)) STORED,
                 statut TEXT NOT NULL DEFAULT 'En attente',
+                client_nom TEXT,
                 FOREIGN KEY(client_id) REFERENCES clients(id) ON DELETE CASCADE
-            )
-            """
-        )
+            );
 
-        cursor.execute(
-            """
             CREATE TABLE IF NOT EXISTS ecritures (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 date_ecriture TEXT NOT NULL,
@@ -91,10 +190,100 @@ class DBManager:
                 compte_debit TEXT NOT NULL,
                 compte_credit TEXT NOT NULL,
                 montant REAL NOT NULL
+            );
+            """
+        )
+
+        # Databases created before montant_ttc became a generated column
+        # store it as a plain column written from Python; rebuild them so
+        # SQLite computes and guarantees the value itself.
+        schema = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'factures'"
+        ).fetchone()
+        if schema is not None and "GENERATED" not in schema["sql"]:
+            conn.executescript(
+                """
+                PRAGMA foreign_keys = OFF;
+                CREATE TABLE factures_migration (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    client_id INTEGER NOT NULL,
+                    date_facture TEXT NOT NULL,
+                    montant_ht REAL NOT NULL,
+                    taux_tva REAL NOT NULL,
+                    montant_ttc REAL GENERATED ALWAYS AS
+                        (montant_ht * (1 + taux_tva / 100.0)) STORED,
+                    statut TEXT NOT NULL DEFAULT 'En attente',
+                    client_nom TEXT,
+                    FOREIGN KEY(client_id) REFERENCES clients(id) ON DELETE CASCADE
+                );
+                INSERT INTO factures_migration
+                    (id, client_id, date_facture, montant_ht, taux_tva, statut)
+                    SELECT id, client_id, date_facture, montant_ht, taux_tva, statut
+                      FROM factures;
+                DROP TABLE factures;
+                ALTER TABLE factures_migration RENAME TO factures;
+                PRAGMA foreign_keys = ON;
+                """
             )
+
+        # The invoice listing reads the client name straight from factures
+        # instead of joining clients on every refresh.  Older databases
+        # gain the denormalised column here; the triggers below keep it in
+        # sync with inserts, re-assignments and client renames.
+        columns = {
+            row["name"]
+            for row in conn.execute("PRAGMA table_info(factures)").fetchall()
+        }
+        if "client_nom" not in columns:
+            conn.execute("ALTER TABLE factures ADD COLUMN client_nom TEXT")
+        conn.execute(
+            "UPDATE factures SET client_nom ="
+            " (SELECT nom FROM clients WHERE id = client_id)"
+            " WHERE client_nom IS NULL"
+        )
+
+        # Triggers and indexes go through one batched script as well.  The
+        # date indexes match the ORDER BY paths of the listing queries so
+        # SQLite can stream rows in index order instead of sorting the
+        # whole table on every refresh; the client_id index turns invoice
+        # lookups by client into an index seek.
+        conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_factures_client_nom_insert
+            AFTER INSERT ON factures
+            BEGIN
+                UPDATE factures
+                   SET client_nom = (SELECT nom FROM clients WHERE id = NEW.client_id)
+                 WHERE id = NEW.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_factures_client_nom_update
+            AFTER UPDATE OF client_id ON factures
+            BEGIN
+                UPDATE factures
+                   SET client_nom = (SELECT nom FROM clients WHERE id = NEW.client_id)
+                 WHERE id = NEW.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_clients_nom_propagate
+            AFTER UPDATE OF nom ON clients
+            BEGIN
+                UPDATE factures SET client_nom = NEW.nom WHERE client_id = NEW.id;
+            END;
+
+            CREATE INDEX IF NOT EXISTS idx_clients_nom ON clients(nom);
+            CREATE INDEX IF NOT EXISTS idx_factures_date
+                ON factures(date_facture DESC, id DESC);
+            CREATE INDEX IF NOT EXISTS idx_factures_client ON factures(client_id);
+            CREATE INDEX IF NOT EXISTS idx_ecritures_date
+                ON ecritures(date_ecriture DESC, id DESC);
             """
         )
 
+        # Give the query planner real statistics for the indexes above so
+        # it picks index-based plans instead of falling back to heuristics.
+        conn.execute("ANALYZE")
+
         conn.commit()
 
     # ------------------------------------------------------------------
@@ -123,20 +312,126 @@ class DBManager:
             When ``True`` the transaction is committed after execution.
         """
 
+        # Pure reads go through the pooled read-only connections so they
+        # never wait on the writer's lock or transactions.  sqlite3 binds
+        # any sequence directly, so parameters are passed through as-is
+        # instead of being copied into a fresh tuple per call.
+        if not commit and (fetchone or fetchall):
+            with self.reader() as reader_conn:
+                if parameters is None:
+                    cursor = reader_conn.execute(query)
+                else:
+                    cursor = reader_conn.execute(query, parameters)
+                return cursor.fetchone() if fetchone else cursor.fetchall()
+
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, tuple(parameters or ()))
+        with self._lock:
+            if parameters is None:
+                cursor = conn.execute(query)
+            else:
+                cursor = conn.execute(query, parameters)
+
+            # Fetch before committing so statements with a RETURNING clause
+            # hand back their rows.
+            result: Any = cursor
+            if fetchone:
+                result = cursor.fetchone()
+            elif fetchall:
+                result = cursor.fetchall()
+
+            if commit:
+                conn.commit()
+            return result
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run several statements atomically in one commit.
+
+        Yields the shared write connection with the writer lock held;
+        commits when the block exits normally and rolls back on exception,
+        so multi-statement flows cost one fsync and never leave partial
+        writes behind.
+        """
+
+        conn = self.get_connection()
+        with self._lock:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def executemany(
+        self,
+        query: str,
+        seq_of_parameters: Iterable[Iterable[Any]],
+        *,
+        commit: bool = True,
+    ) -> None:
+        """Run one statement for many parameter rows in a single transaction.
+
+        The whole batch pays one BEGIN/COMMIT (and therefore one fsync)
+        instead of one per row, which is what makes bulk imports fast.
+        """
 
         if commit:
-            conn.commit()
+            with self.transaction() as conn:
+                conn.executemany(query, seq_of_parameters)
+        else:
+            conn = self.get_connection()
+            with self._lock:
+                conn.executemany(query, seq_of_parameters)
 
-        if fetchone:
-            return cursor.fetchone()
-        if fetchall:
+    def fetchone(self, query: str, parameters: Iterable[Any] = ()) -> Any:
+        """Fetch a single row with as little wrapper overhead as possible.
+
+        Tiny point lookups run constantly from the UI; this skips the
+        option handling of :meth:`execute` and goes straight to a pooled
+        read-only connection.
+        """
+
+        with self.reader() as conn:
+            return conn.execute(query, parameters).fetchone()
+
+    def fetchall(
+        self, query: str, parameters: Iterable[Any] = (), *, raw: bool = False
+    ) -> Any:
+        """Fetch all rows of a read-only query, like :meth:`fetchone`.
+
+        With ``raw=True`` the rows come back as plain tuples instead of
+        :class:`sqlite3.Row`, skipping one wrapper allocation per row;
+        meant for columnar consumers that only use positional access.
+        """
+
+        with self.reader() as conn:
+            cursor = conn.execute(query, parameters)
+            if raw:
+                cursor.row_factory = None
             return cursor.fetchall()
-        return cursor
 
 
-# Expose a shared manager for the whole application.
+# Path of the application database, resolved relative to the package.
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "database.db"
-db_manager = DBManager(DB_PATH)
+
+# Shared manager for the whole application, created on first use so merely
+# importing this module neither opens the database file nor runs the
+# schema DDL.
+_db_manager: Optional[DBManager] = None
+
+
+def get_db_manager() -> DBManager:
+    """Return the shared :class:`DBManager`, creating it on first call."""
+
+    global _db_manager
+    if _db_manager is None:
+        _db_manager = DBManager(DB_PATH)
+    return _db_manager
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep ``from utils.db_manager import db_manager`` working
+    # while deferring the connection to the moment it is actually used.
+    if name == "db_manager":
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")